@@ -178,8 +178,8 @@ class PlexClient(PlexObject):
 
     def query(self, path, method=None, headers=None, timeout=None, **kwargs):
         """ Main method used to handle HTTPS requests to the Plex client. This method helps
-            by encoding the response to utf-8 and parsing the returned XML into and
-            ElementTree object. Returns None if no data exists in the response.
+            by parsing the raw response bytes into an ElementTree object. Returns None if
+            no data exists in the response.
         """
         url = self.url(path)
         method = method or self._session.get
@@ -188,7 +188,7 @@ class PlexClient(PlexObject):
         headers = self._headers(**headers or {})
         response = method(url, headers=headers, timeout=timeout, **kwargs)
         if response.status_code not in (200, 201, 204):
-            codename = codes.get(response.status_code)[0]
+            codename = codes.get(response.status_code, ('unknown',))[0]
             errtext = response.text.replace('\n', ' ')
             message = f'({response.status_code}) {codename}; {response.url} {errtext}'
             if response.status_code == 401:
@@ -197,7 +197,7 @@ class PlexClient(PlexObject):
                 raise NotFound(message)
             else:
                 raise BadRequest(message)
-        data = response.text.encode('utf8')
+        data = response.content
         return ElementTree.fromstring(data) if data.strip() else None
 
     def sendCommand(self, command, proxy=None, **params):
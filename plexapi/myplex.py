@@ -233,7 +233,7 @@ class MyPlexAccount(PlexObject):
         headers = self._headers(**headers or {})
         response = method(url, headers=headers, timeout=timeout, **kwargs)
         if response.status_code not in (200, 201, 204):  # pragma: no cover
-            codename = codes.get(response.status_code)[0]
+            codename = codes.get(response.status_code, ('unknown',))[0]
             errtext = response.text.replace('\n', ' ')
             message = f'({response.status_code}) {codename}; {response.url} {errtext}'
             if response.status_code == 401:
@@ -250,7 +250,7 @@ class MyPlexAccount(PlexObject):
             return response.json()
         elif 'text/plain' in response.headers.get('Content-Type', ''):
             return response.text.strip()
-        data = response.text.encode('utf8')
+        data = response.content
         return ElementTree.fromstring(data) if data.strip() else None
 
     def ping(self):
@@ -863,7 +863,7 @@ class MyPlexAccount(PlexObject):
         """
         response = self._session.get('https://plex.tv/api/claim/token.json', headers=self._headers(), timeout=TIMEOUT)
         if response.status_code not in (200, 201, 204):  # pragma: no cover
-            codename = codes.get(response.status_code)[0]
+            codename = codes.get(response.status_code, ('unknown',))[0]
             errtext = response.text.replace('\n', ' ')
             raise BadRequest(f'({response.status_code}) {codename} {response.url}; {errtext}')
         return response.json()['token']
@@ -1872,10 +1872,10 @@ class MyPlexPinLogin:
         headers = headers or self._headers()
         response = method(url, headers=headers, timeout=self._requestTimeout, **kwargs)
         if not response.ok:  # pragma: no cover
-            codename = codes.get(response.status_code)[0]
+            codename = codes.get(response.status_code, ('unknown',))[0]
             errtext = response.text.replace('\n', ' ')
             raise BadRequest(f'({response.status_code}) {codename} {response.url}; {errtext}')
-        data = response.text.encode('utf8')
+        data = response.content
         return ElementTree.fromstring(data) if data.strip() else None
 
 
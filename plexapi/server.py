@@ -1,18 +1,27 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import cached_property
 from urllib.parse import urlencode
 from xml.etree import ElementTree
+from xml.parsers import expat
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
-from plexapi import BASE_HEADERS, CONFIG, TIMEOUT, log, logfilter
+from plexapi import BASE_HEADERS, CACHE_TTL, CONFIG, TIMEOUT, log, logfilter
 from plexapi import utils
 from plexapi.alert import AlertListener
 from plexapi.base import PlexObject
 from plexapi.client import PlexClient
 from plexapi.collection import Collection
-from plexapi.exceptions import BadRequest, NotFound, Unauthorized
+from plexapi.exceptions import BadRequest, NotFound, Unauthorized, Unsupported
 from plexapi.library import Hub, Library, Path, File
 from plexapi.media import Conversion, Optimized
 from plexapi.playlist import Playlist
@@ -21,13 +30,27 @@ from plexapi.settings import Settings
 from plexapi.utils import deprecated
 from requests.status_codes import _codes as codes
 
-# Need these imports to populate utils.PLEXOBJECTS
-from plexapi import audio as _audio  # noqa: F401
-from plexapi import collection as _collection  # noqa: F401
-from plexapi import media as _media  # noqa: F401
-from plexapi import photo as _photo  # noqa: F401
-from plexapi import playlist as _playlist  # noqa: F401
-from plexapi import video as _video  # noqa: F401
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
+# Status codes of a successful response from the Plex server
+OK_STATUS_CODES = frozenset((200, 201, 204))
+
+# Max connections kept open per host, also used to size batch() and the async client
+POOL_SIZE = 16
+
+# Connection pools shared by the default sessions of all PlexServer instances
+SHARED_ADAPTER = HTTPAdapter(
+    pool_connections=8, pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                      allowed_methods=('GET', 'HEAD'), raise_on_status=False))
 
 
 class PlexServer(PlexObject):
@@ -41,7 +64,8 @@ class PlexServer(PlexObject):
             baseurl (str): Base url for to access the Plex Media Server (default: 'http://localhost:32400').
             token (str): Required Plex authentication token to access the server.
             session (requests.Session, optional): Use your own session object if you want to
-                cache the http responses from the server.
+                cache the http responses from the server. The default session uses a pool of
+                keep-alive connections shared by all PlexServer instances.
             timeout (int, optional): Timeout in seconds on initial connection to the server
                 (default config.TIMEOUT).
 
@@ -102,17 +126,26 @@ class PlexServer(PlexObject):
             _session (obj): Requests session object used to access this client.
     """
     key = '/'
+    CACHE_SIZE = 128
+    STREAM_SIZE = 65536
 
     def __init__(self, baseurl=None, token=None, session=None, timeout=None):
         self._baseurl = baseurl or CONFIG.get('auth.server_baseurl', 'http://localhost:32400')
         self._baseurl = self._baseurl.rstrip('/')
         self._token = logfilter.add_secret(token or CONFIG.get('auth.server_token'))
         self._showSecrets = CONFIG.get('log.show_secrets', '').lower() == 'true'
-        self._session = session or requests.Session()
+        self._tokenHeader = {}
+        self._tokenArg = None
+        if self._token:
+            self._tokenHeader = {'X-Plex-Token': self._token}
+            self._tokenArg = f'X-Plex-Token={self._token}'
+        self._session = session or self._createSession()
         self._timeout = timeout or TIMEOUT
-        self._myPlexAccount = None   # cached myPlexAccount
-        self._systemAccounts = None   # cached list of SystemAccount
-        self._systemDevices = None   # cached list of SystemDevice
+        self._cache = OrderedDict()   # cached GET responses {cacheKey: (expires, etag, data)}
+        self._cacheTTL = CACHE_TTL
+        self._cacheLock = threading.Lock()   # guards _cache, queries may run in batch() threads
+        self._asyncSession = None
+        self._asyncLoop = None
         data = self.query(self.key, timeout=self._timeout)
         super(PlexServer, self).__init__(self, data, self.key)
 
@@ -163,11 +196,32 @@ class PlexServer(PlexObject):
 
     def _headers(self, **kwargs):
         """ Returns dict containing base headers for all requests to the server. """
-        headers = BASE_HEADERS.copy()
-        if self._token:
-            headers['X-Plex-Token'] = self._token
-        headers.update(kwargs)
-        return headers
+        return {**BASE_HEADERS, **self._tokenHeader, **kwargs}
+
+    @staticmethod
+    def _createSession():
+        """ Returns a new requests session using the connection pool shared by all
+            :class:`~plexapi.server.PlexServer` instances, so keep-alive connections
+            are reused across requests and across servers. Idempotent requests
+            are retried with backoff on connection errors and 502, 503 or 504 responses.
+            When ``plexapi.http_cache`` is configured, GET responses are also cached in
+            a persistent SQLite database using ``requests-cache``. Cached responses are
+            keyed on the ``X-Plex-Token`` header, so users sharing the session never
+            see each other's responses.
+        """
+        cachePath = CONFIG.get('plexapi.http_cache')
+        if cachePath and CachedSession is None:
+            log.warning("Can't use plexapi.http_cache without requests-cache")
+        if cachePath and CachedSession is not None:
+            session = CachedSession(
+                cache_name=os.path.expanduser(cachePath), backend='sqlite',
+                expire_after=CONFIG.get('plexapi.http_cache_expire', 60, int), allowable_methods=('GET',),
+                match_headers=['X-Plex-Token'])
+        else:
+            session = requests.Session()
+        session.mount('http://', SHARED_ADAPTER)
+        session.mount('https://', SHARED_ADAPTER)
+        return session
 
     def _uriRoot(self):
         return f'server://{self.machineIdentifier}/com.plexapp.plugins.library'
@@ -276,11 +330,13 @@ class PlexServer(PlexObject):
             timeout = self._timeout
         return PlexServer(self._baseurl, token=userToken, session=session, timeout=timeout)
 
+    @cached_property
+    def _systemAccounts(self):
+        """ Cached list of :class:`~plexapi.server.SystemAccount` objects. """
+        return self.fetchItems('/accounts', SystemAccount)
+
     def systemAccounts(self):
         """ Returns a list of :class:`~plexapi.server.SystemAccount` objects this server contains. """
-        if self._systemAccounts is None:
-            key = '/accounts'
-            self._systemAccounts = self.fetchItems(key, SystemAccount)
         return self._systemAccounts
 
     def systemAccount(self, accountID):
@@ -294,11 +350,13 @@ class PlexServer(PlexObject):
         except StopIteration:
             raise NotFound(f'Unknown account with accountID={accountID}') from None
 
+    @cached_property
+    def _systemDevices(self):
+        """ Cached list of :class:`~plexapi.server.SystemDevice` objects. """
+        return self.fetchItems('/devices', SystemDevice)
+
     def systemDevices(self):
         """ Returns a list of :class:`~plexapi.server.SystemDevice` objects this server contains. """
-        if self._systemDevices is None:
-            key = '/devices'
-            self._systemDevices = self.fetchItems(key, SystemDevice)
         return self._systemDevices
 
     def systemDevice(self, deviceID):
@@ -312,14 +370,17 @@ class PlexServer(PlexObject):
         except StopIteration:
             raise NotFound(f'Unknown device with deviceID={deviceID}') from None
 
+    @cached_property
+    def _myPlexAccount(self):
+        """ Cached :class:`~plexapi.myplex.MyPlexAccount` for this server's token. """
+        from plexapi.myplex import MyPlexAccount
+        return MyPlexAccount(token=self._token, session=self._session)
+
     def myPlexAccount(self):
         """ Returns a :class:`~plexapi.myplex.MyPlexAccount` object using the same
             token to access this server. If you are not the owner of this PlexServer
             you're likely to receive an authentication error calling this.
         """
-        if self._myPlexAccount is None:
-            from plexapi.myplex import MyPlexAccount
-            self._myPlexAccount = MyPlexAccount(token=self._token, session=self._session)
         return self._myPlexAccount
 
     def _myPlexClientPorts(self):
@@ -400,20 +461,17 @@ class PlexServer(PlexObject):
         """ Returns list of all :class:`~plexapi.client.PlexClient` objects connected to server. """
         items = []
         ports = None
-        for elem in self.query('/clients'):
-            port = elem.attrib.get('port')
-            if not port:
-                log.warning('%s did not advertise a port, checking plex.tv.', elem.attrib.get('name'))
-                ports = self._myPlexClientPorts() if ports is None else ports
-                port = ports.get(elem.attrib.get('machineIdentifier'))
-            baseurl = f"http://{elem.attrib['host']}:{port}"
-            items.append(PlexClient(baseurl=baseurl, server=self,
-                                    token=self._token, data=elem, connect=False))
+        for elem in self._iterquery('/clients'):
+            if not elem.attrib.get('port') and ports is None:
+                ports = self._myPlexClientPorts()
+            items.append(self._buildClient(elem, ports))
 
         return items
 
     def client(self, name):
         """ Returns the :class:`~plexapi.client.PlexClient` that matches the specified name.
+            The name is matched case-insensitively and the server response is only read
+            until the matching client is found.
 
             Parameters:
                 name (str): Name of the client to return.
@@ -421,12 +479,26 @@ class PlexServer(PlexObject):
             Raises:
                 :exc:`~plexapi.exceptions.NotFound`: Unknown client name.
         """
-        for client in self.clients():
-            if client and client.title == name:
-                return client
+        needle = name.casefold()
+        for elem in self._iterquery('/clients'):
+            title = elem.attrib.get('title') or elem.attrib.get('name')
+            if title and title.casefold() == needle:
+                return self._buildClient(elem)
 
         raise NotFound(f'Unknown client name: {name}')
 
+    def _buildClient(self, elem, ports=None):
+        """ Returns a :class:`~plexapi.client.PlexClient` for a client element returned by the
+            server. Clients that do not advertise a port are looked up in ``ports`` or on plex.tv.
+        """
+        port = elem.attrib.get('port')
+        if not port:
+            log.warning('%s did not advertise a port, checking plex.tv.', elem.attrib.get('name'))
+            ports = self._myPlexClientPorts() if ports is None else ports
+            port = ports.get(elem.attrib.get('machineIdentifier'))
+        baseurl = f"http://{elem.attrib['host']}:{port}"
+        return PlexClient(baseurl=baseurl, server=self, token=self._token, data=elem, connect=False)
+
     def createCollection(self, title, section, items=None, smart=False, limit=None,
                          libtype=None, sort=None, filters=None, **kwargs):
         """ Creates and returns a new :class:`~plexapi.collection.Collection`.
@@ -748,17 +820,187 @@ class PlexServer(PlexObject):
 
     def query(self, key, method=None, headers=None, params=None, timeout=None, **kwargs):
         """ Main method used to handle HTTPS requests to the Plex server. This method helps
-            by encoding the response to utf-8 and parsing the returned XML into and
-            ElementTree object. Returns None if no data exists in the response.
+            by parsing the raw response bytes into an ElementTree object, streaming large
+            responses into the parser. Returns None if no data exists in the response.
+            GET responses are cached for ``plexapi.cache_ttl`` seconds when caching is enabled.
+            Expired responses with an ETag are revalidated with ``If-None-Match``.
         """
         url = self.url(key)
+        cacheKey = cached = None
+        if method is None or method.__name__ == 'get':
+            if self._cacheTTL and params is None and not kwargs:
+                cacheKey = (url, frozenset(headers.items()) if headers else None)
+                with self._cacheLock:
+                    cached = self._cache.get(cacheKey)
+                    if cached and cached[0] > time.monotonic():
+                        self._cache.move_to_end(cacheKey)
+                        return cached[2]
+        else:
+            self.clearCache()
         method = method or self._session.get
         timeout = timeout or self._timeout
         log.debug('%s %s', method.__name__.upper(), url)
         headers = self._headers(**headers or {})
-        response = method(url, headers=headers, params=params, timeout=timeout, **kwargs)
-        if response.status_code not in (200, 201, 204):
-            codename = codes.get(response.status_code)[0]
+        if cached and cached[1]:
+            # Revalidate the expired cache entry instead of downloading it again
+            headers = {**headers, 'If-None-Match': cached[1]}
+        response = method(url, headers=headers, params=params, timeout=timeout, stream=True, **kwargs)
+        with response:
+            if cached and response.status_code == 304:
+                # Read the empty body so the connection is returned to the pool
+                response.content
+                etag, data = cached[1], cached[2]
+            else:
+                self._checkResponse(response)
+                etag = response.headers.get('ETag')
+                data = self._parseResponse(response)
+        if cacheKey is not None:
+            with self._cacheLock:
+                self._cache[cacheKey] = (time.monotonic() + self._cacheTTL, etag, data)
+                self._cache.move_to_end(cacheKey)
+                while len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return data
+
+    def batch(self, keys):
+        """ Query multiple keys concurrently over the pooled session and return a dict of
+            ``{key: ElementTree}``. This saves the round trip latency of querying each key
+            one after the other. The first error raised by any of the queries is re-raised.
+
+            Parameters:
+                keys (List<str>): Keys of the endpoints to query.
+
+            Example:
+
+                .. code-block:: python
+
+                    data = plex.batch(['/library/', '/clients', '/playlists'])
+                    library = Library(plex, data['/library/'])
+
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(keys), POOL_SIZE)) as executor:
+            return dict(zip(keys, executor.map(self.query, keys)))
+
+    def _asyncClient(self):
+        """ Returns the ``httpx.AsyncClient`` used by the async query methods, creating it on first use.
+            A client can only be used on the event loop it was created on, so a new client is created
+            when called from another event loop, e.g. by a second ``asyncio.run()``.
+        """
+        if httpx is None:
+            raise Unsupported('The httpx package is required for async queries: pip install "plexapi[async]"')
+        loop = asyncio.get_running_loop()
+        if self._asyncSession is None or self._asyncLoop is not loop:
+            limits = httpx.Limits(max_keepalive_connections=POOL_SIZE)
+            try:
+                self._asyncSession = httpx.AsyncClient(http2=True, limits=limits)
+            except ImportError:
+                # HTTP/2 requires the h2 package, fall back to HTTP/1.1
+                self._asyncSession = httpx.AsyncClient(limits=limits)
+            self._asyncLoop = loop
+        return self._asyncSession
+
+    async def aquery(self, key, method='GET', headers=None, params=None, timeout=None, **kwargs):
+        """ Asynchronous version of :func:`~plexapi.server.PlexServer.query` using an
+            ``httpx.AsyncClient``. Multiple queries can be awaited together with ``asyncio.gather()``.
+            For an https server with ``h2`` installed, the queries are multiplexed over a single
+            HTTP/2 connection. Otherwise, including the default ``http://localhost:32400``, they
+            run over a pool of HTTP/1.1 keep-alive connections. Responses are not cached.
+
+            Note: ``httpx`` must be installed in order to use this feature.
+
+            .. code-block:: python
+
+                >> pip install "plexapi[async]"
+
+            Parameters:
+                key (str): Key of the endpoint to query.
+                method (str): HTTP method to use (default: 'GET').
+
+            Raises:
+                :exc:`~plexapi.exceptions.Unsupported`: httpx not installed.
+        """
+        client = self._asyncClient()
+        url = self.url(key)
+        method = method.upper()
+        if method != 'GET':
+            self.clearCache()
+        timeout = timeout or self._timeout
+        log.debug('%s %s', method, url)
+        headers = self._headers(**headers or {})
+        response = await client.request(method, url, headers=headers, params=params, timeout=timeout, **kwargs)
+        self._checkResponse(response)
+        data = response.content
+        return ElementTree.fromstring(data) if data.strip() else None
+
+    async def aclose(self):
+        """ Close the ``httpx.AsyncClient`` used by the async query methods. Await this before
+            the event loop is closed to release the client's open connections.
+        """
+        if self._asyncSession is not None:
+            await self._asyncSession.aclose()
+            self._asyncSession = None
+            self._asyncLoop = None
+
+    async def aclients(self):
+        """ Asynchronous version of :func:`~plexapi.server.PlexServer.clients`. """
+        items = []
+        ports = None
+        for elem in await self.aquery('/clients'):
+            if not elem.attrib.get('port') and ports is None:
+                # Look up the ports from plex.tv without blocking the event loop
+                loop = asyncio.get_running_loop()
+                ports = await loop.run_in_executor(None, self._myPlexClientPorts)
+            items.append(self._buildClient(elem, ports))
+        return items
+
+    async def asessions(self):
+        """ Asynchronous version of :func:`~plexapi.server.PlexServer.sessions`. """
+        key = '/status/sessions'
+        return self.findItems(await self.aquery(key), initpath=key)
+
+    async def alibrary(self):
+        """ Asynchronous version of :attr:`~plexapi.server.PlexServer.library`.
+
+            Example:
+
+                .. code-block:: python
+
+                    clients, sessions, library = await asyncio.gather(
+                        plex.aclients(), plex.asessions(), plex.alibrary())
+
+        """
+        try:
+            data = await self.aquery(Library.key)
+        except BadRequest:
+            # Only the owner has access to /library
+            data = await self.aquery('/library/sections/')
+        return Library(self, data)
+
+    def _parseResponse(self, response):
+        """ Parses the body of a streamed response into an ElementTree object. Bodies larger
+            than ``STREAM_SIZE`` bytes, or of unknown length, are fed to the XML parser in
+            chunks as they are received. Returns None if the body is empty.
+        """
+        length = response.headers.get('Content-Length')
+        if length is not None and int(length) <= self.STREAM_SIZE:
+            data = response.content
+            return ElementTree.fromstring(data) if data.strip() else None
+        parser = ElementTree.XMLParser()
+        empty = True
+        for chunk in response.iter_content(8192):
+            if empty and not chunk.strip():
+                continue
+            empty = False
+            parser.feed(chunk)
+        return None if empty else parser.close()
+
+    def _checkResponse(self, response):
+        """ Raises the matching :mod:`~plexapi.exceptions` error if the response was unsuccessful. """
+        if response.status_code not in OK_STATUS_CODES:
+            codename = codes.get(response.status_code, ('unknown',))[0]
             errtext = response.text.replace('\n', ' ')
             message = f'({response.status_code}) {codename}; {response.url} {errtext}'
             if response.status_code == 401:
@@ -767,8 +1009,81 @@ class PlexServer(PlexObject):
                 raise NotFound(message)
             else:
                 raise BadRequest(message)
-        data = response.text.encode('utf8')
-        return ElementTree.fromstring(data) if data.strip() else None
+
+    def _iterquery(self, key, tag=None):
+        """ Streams a GET request to the Plex server and yields each top level element of the
+            response as soon as it has been parsed. Yielded elements are detached from the root
+            element, so elements the caller does not keep are freed while the rest of the
+            response is still being read. Stopping the iteration early closes the response.
+
+            Parameters:
+                key (str): Key of the endpoint to query.
+                tag (str, optional): Only yield elements with this tag.
+        """
+        url = self.url(key)
+        log.debug('GET %s', url)
+        response = self._session.get(url, headers=self._headers(), timeout=self._timeout, stream=True)
+        with response:
+            self._checkResponse(response)
+            response.raw.decode_content = True
+            root = None
+            depth = 0
+            try:
+                for event, elem in ElementTree.iterparse(response.raw, events=('start', 'end')):
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                        depth += 1
+                        continue
+                    depth -= 1
+                    if depth == 1:
+                        if tag is None or elem.tag == tag:
+                            yield elem
+                        root.remove(elem)
+            except ElementTree.ParseError as err:
+                # An empty response has no elements to yield, anything else is invalid XML
+                if root is not None or err.code != expat.errors.codes[expat.errors.XML_ERROR_NO_ELEMENTS]:
+                    raise
+
+    @contextmanager
+    def cacheDisabled(self):
+        """ Context manager to bypass all response caching, e.g. to force a refresh after
+            changing something on the server outside of :func:`~plexapi.server.PlexServer.query`.
+            This disables the in-memory ``plexapi.cache_ttl`` cache and, when the session is a
+            ``requests_cache.CachedSession``, its persistent cache as well.
+
+            Example:
+
+                .. code-block:: python
+
+                    with plex.cacheDisabled():
+                        sessions = plex.sessions()
+
+        """
+        cacheTTL, self._cacheTTL = self._cacheTTL, 0
+        try:
+            if hasattr(self._session, 'cache_disabled'):
+                with self._session.cache_disabled():
+                    yield self
+            else:
+                yield self
+        finally:
+            self._cacheTTL = cacheTTL
+
+    def clearCache(self, key=None):
+        """ Clear the cached GET responses (see the ``plexapi.cache_ttl`` config option).
+
+            Parameters:
+                key (str, optional): Only clear cached responses for keys starting with this path.
+                    Default clears the entire cache.
+        """
+        with self._cacheLock:
+            if key is None:
+                self._cache.clear()
+                return
+            prefix = f'{self._baseurl}{key}'
+            for cacheKey in [k for k in self._cache if k[0].startswith(prefix)]:
+                del self._cache[cacheKey]
 
     def search(self, query, mediatype=None, limit=None, sectionId=None):
         """ Returns a list of media items or filter categories from the resulting
@@ -885,16 +1200,16 @@ class PlexServer(PlexObject):
         if imageFormat is not None:
             params['format'] = imageFormat.lower()
 
-        key = f'/photo/:/transcode{utils.joinArgs(params)}'
-        return self.url(key, includeToken=True)
+        # The query string always starts with '?', so append the token directly
+        url = f'{self._baseurl}/photo/:/transcode{utils.joinArgs(params)}'
+        return f'{url}&{self._tokenArg}' if self._tokenArg else url
 
     def url(self, key, includeToken=None):
         """ Build a URL string with proper token argument.  Token will be appended to the URL
             if either includeToken is True or CONFIG.log.show_secrets is 'true'.
         """
-        if self._token and (includeToken or self._showSecrets):
-            delim = '&' if '?' in key else '?'
-            return f'{self._baseurl}{key}{delim}X-Plex-Token={self._token}'
+        if self._tokenArg and (includeToken or self._showSecrets):
+            return f"{self._baseurl}{key}{'&' if '?' in key else '?'}{self._tokenArg}"
         return f'{self._baseurl}{key}'
 
     def refreshSynclist(self):
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import base64
 import functools
+import importlib
 import json
 import logging
 import os
@@ -95,6 +96,7 @@ REVERSETAGTYPES = {v: k for k, v in TAGTYPES.items()}
 
 # Plex Objects - Populated at runtime
 PLEXOBJECTS = {}
+PLEXOBJECT_MODULES = ('audio', 'collection', 'media', 'photo', 'playlist', 'video')
 
 
 class SecretsFilter(logging.Filter):
@@ -136,10 +138,20 @@ def registerPlexObject(cls):
     return cls
 
 
+@functools.lru_cache(maxsize=None)
+def loadPlexObjects():
+    """ Import the modules that register their classes in PLEXOBJECTS. This is deferred until
+        the first lookup so importing :mod:`plexapi.server` does not load every media module.
+    """
+    for module in PLEXOBJECT_MODULES:
+        importlib.import_module(f'plexapi.{module}')
+
+
 def getPlexObject(ehash, default):
     """ Return the PlexObject class for the specified ehash. This recursively looks up the class
         with the highest specificity, falling back to the default class if not found.
     """
+    loadPlexObjects()
     cls = PLEXOBJECTS.get(ehash)
     if cls is not None:
         return cls
@@ -443,7 +455,7 @@ def download(url, token, filename=None, savepath=None, session=None, chunksize=4
     headers = {'X-Plex-Token': token}
     response = session.get(url, headers=headers, stream=True)
     if response.status_code not in (200, 201, 204):
-        codename = codes.get(response.status_code)[0]
+        codename = codes.get(response.status_code, ('unknown',))[0]
         errtext = response.text.replace('\n', ' ')
         message = f'({response.status_code}) {codename}; {response.url} {errtext}'
         if response.status_code == 401:
@@ -33,6 +33,8 @@ setup(
     install_requires=requirements,
     extras_require={
         'alert': ["websocket-client>=1.3.3"],
+        'async': ["httpx[http2]>=0.23"],
+        'cache': ["requests-cache>=1.0"],
     },
     python_requires='>=3.8',
     long_description=readme,
@@ -15,7 +15,7 @@ from plexapi.myplex import MyPlexAccount
 from plexapi.server import PlexServer
 from plexapi.utils import createMyPlexDevice
 
-from .payloads import ACCOUNT_XML
+from .payloads import ACCOUNT_XML, SERVER_ROOT
 
 try:
     from unittest.mock import patch, MagicMock, mock_open
@@ -164,6 +164,12 @@ def mocked_account(requests_mock):
     return MyPlexAccount(token="faketoken")
 
 
+@pytest.fixture()
+def mocked_plex(requests_mock):
+    requests_mock.get("http://mocked-plex:32400/", text=SERVER_ROOT)
+    return PlexServer("http://mocked-plex:32400", token="faketoken")
+
+
 @pytest.fixture(scope="session")
 def plex(request, sess):
     assert SERVER_BASEURL, "Required SERVER_BASEURL not specified."
@@ -353,13 +359,17 @@ def callable_http_patch():
     """This is intended to stop some http requests inside some tests."""
     return patch(
         "plexapi.server.requests.sessions.Session.send",
-        return_value=MagicMock(status_code=200, text="<xml><child></child></xml>"),
+        return_value=MagicMock(
+            status_code=200, text="<xml><child></child></xml>", content=b"<xml><child></child></xml>"
+        ),
     )
 
 
 @pytest.fixture()
 def empty_response(mocker):
-    response = mocker.MagicMock(status_code=200, text="<xml><child></child></xml>")
+    response = mocker.MagicMock(
+        status_code=200, text="<xml><child></child></xml>", content=b"<xml><child></child></xml>"
+    )
     return response
 
 
@@ -368,7 +378,9 @@ def patched_http_call(mocker):
     """This will stop any http calls inside any test."""
     return mocker.patch(
         "plexapi.server.requests.sessions.Session.send",
-        return_value=MagicMock(status_code=200, text="<xml><child></child></xml>"),
+        return_value=MagicMock(
+            status_code=200, text="<xml><child></child></xml>", content=b"<xml><child></child></xml>"
+        ),
     )
 
 
@@ -44,3 +44,28 @@ MYPLEX_INVITE = """<MediaContainer friendlyName="myPlex" identifier="com.plexapp
 </Invite>
 </MediaContainer>
 """
+
+SERVER_ROOT = """<MediaContainer size="0" friendlyName="Mocked Server" machineIdentifier="mockedmachineidentifier" version="1.40.0.0000-000000000" platform="Linux" myPlex="1" allowSync="1" transcoderActiveVideoSessions="0">
+</MediaContainer>
+"""
+
+SERVER_CLIENTS = """<MediaContainer size="3">
+  <Server name="Living Room TV" host="192.168.1.21" address="192.168.1.21" port="32500" machineIdentifier="client-1" version="1.0" protocol="plex" product="Plex for Android (TV)" deviceClass="tv" protocolVersion="3" protocolCapabilities="timeline,playback,navigation"/>
+  <Server host="192.168.1.22" address="192.168.1.22" port="32500" machineIdentifier="client-2" version="1.0" protocol="plex" product="Plex Web" deviceClass="pc" protocolVersion="3" protocolCapabilities="timeline,playback"/>
+  <Server name="Kitchen Speaker" host="192.168.1.23" address="192.168.1.23" machineIdentifier="client-3" version="1.0" protocol="plex" product="Plexamp" deviceClass="speaker" protocolVersion="3" protocolCapabilities="timeline,playback,playqueues"/>
+</MediaContainer>
+"""
+
+SERVER_LIBRARY = """<MediaContainer size="1" allowSync="0" art="/:/resources/library-art.png" content="" identifier="com.plexapp.plugins.library" mediaTagPrefix="/system/bundle/media/flags/" mediaTagVersion="1700000000" title1="Plex Library" title2="">
+  <Directory key="sections" title="Library Sections"/>
+</MediaContainer>
+"""
+
+SERVER_SESSIONS = """<MediaContainer size="1">
+  <Video ratingKey="1" key="/library/metadata/1" librarySectionID="1" sessionKey="5" title="Elephants Dream" type="movie" viewOffset="1000">
+    <User id="1" thumb="" title="testuser"/>
+    <Player address="192.168.1.21" machineIdentifier="client-1" platform="Android" product="Plex for Android (TV)" state="playing" title="Living Room TV"/>
+    <Session id="mockedsessionid" bandwidth="10000" location="lan"/>
+  </Video>
+</MediaContainer>
+"""
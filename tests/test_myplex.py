@@ -365,3 +365,10 @@ def test_myplex_geoip(account):
 
 def test_myplex_ping(account):
     assert account.ping()
+
+
+def test_myplex_query_unknown_status_code(mocked_account, requests_mock):
+    url = "https://plex.tv/api/v2/unknown/status"
+    requests_mock.get(url, status_code=599, text="Unknown")
+    with pytest.raises(BadRequest, match=r"\(599\) unknown"):
+        mocked_account.query(url)
@@ -1,18 +1,24 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import re
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import quote_plus
+from xml.etree import ElementTree
 
+import plexapi
 import pytest
 from datetime import datetime
 from PIL import Image
-from plexapi.exceptions import BadRequest, NotFound
+from plexapi.exceptions import BadRequest, NotFound, Unsupported
 from plexapi.server import PlexServer
 from plexapi.utils import download
 from requests import Session
 
 from . import conftest as utils
-from .payloads import SERVER_RESOURCES, SERVER_TRANSCODE_SESSIONS
+from .payloads import (SERVER_CLIENTS, SERVER_LIBRARY, SERVER_RESOURCES, SERVER_ROOT,
+                       SERVER_SESSIONS, SERVER_TRANSCODE_SESSIONS)
 
 
 def test_server_attr(plex, account):
@@ -193,6 +199,155 @@ def test_server_Server_query(plex):
         assert plex.query("/asdf/1234/asdf", headers={"random_headers": "1234"})
 
 
+def test_server_query_cache(mocked_plex, requests_mock):
+    requests_mock.get(mocked_plex.url("/statistics/resources"), text=SERVER_RESOURCES)
+    mocked_plex._cacheTTL = 60
+    calls = requests_mock.call_count
+    assert mocked_plex.query("/statistics/resources") is mocked_plex.query("/statistics/resources")
+    assert requests_mock.call_count == calls + 1
+    mocked_plex.clearCache("/statistics")
+    mocked_plex.query("/statistics/resources")
+    assert requests_mock.call_count == calls + 2
+
+
+def test_server_query_cache_etag(mocked_plex, requests_mock):
+    url = mocked_plex.url("/statistics/resources")
+    requests_mock.get(url, text=SERVER_RESOURCES, headers={"ETag": '"1234"'})
+    mocked_plex._cacheTTL = 60
+    data = mocked_plex.query("/statistics/resources")
+    # Expire the cache entry so the next query is revalidated
+    cacheKey, (_, etag, _) = next(iter(mocked_plex._cache.items()))
+    mocked_plex._cache[cacheKey] = (0, etag, data)
+    requests_mock.get(url, status_code=304)
+    assert mocked_plex.query("/statistics/resources") is data
+    assert requests_mock.last_request.headers["If-None-Match"] == '"1234"'
+
+
+def test_server_query_cache_etag_reuses_connection():
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == '"1234"':
+                self.send_response(304)
+                self.send_header("ETag", '"1234"')
+                self.end_headers()
+                return
+            body = b'<MediaContainer friendlyName="test"/>'
+            self.send_response(200)
+            self.send_header("ETag", '"1234"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        plex = PlexServer(f"http://127.0.0.1:{httpd.server_port}", token="faketoken")
+        plex._cacheTTL = 60
+        data = plex.query("/identity")
+        for _ in range(20):
+            # Expire the cache entry so every query is revalidated with a 304
+            cacheKey, (_, etag, _) = next(iter(plex._cache.items()))
+            plex._cache[cacheKey] = (0, etag, data)
+            assert plex.query("/identity") is data
+        assert len(connections) == 1
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_server_query_base_headers(mocked_plex, requests_mock, monkeypatch):
+    requests_mock.get(mocked_plex.url("/sync"), text="<MediaContainer/>")
+    # Changes made after the server is created, like in the sync-target recipe, are sent
+    monkeypatch.setitem(plexapi.BASE_HEADERS, "X-Plex-Sync-Version", "2")
+    monkeypatch.setitem(plexapi.BASE_HEADERS, "X-Plex-Provides", "sync-target")
+    mocked_plex.query("/sync")
+    headers = requests_mock.last_request.headers
+    assert headers["X-Plex-Sync-Version"] == "2"
+    assert headers["X-Plex-Provides"] == "sync-target"
+    assert headers["X-Plex-Token"] == "faketoken"
+    mocked_plex.query("/sync", headers={"X-Plex-Token": "othertoken"})
+    assert requests_mock.last_request.headers["X-Plex-Token"] == "othertoken"
+
+
+def test_server_query_unknown_status_code(mocked_plex, requests_mock):
+    requests_mock.get(mocked_plex.url("/unknown/status"), status_code=599, text="Unknown")
+    with pytest.raises(BadRequest, match=r"\(599\) unknown"):
+        mocked_plex.query("/unknown/status")
+
+
+def test_server_http_cache_per_token(requests_mock, monkeypatch, tmp_path):
+    pytest.importorskip("requests_cache")
+    monkeypatch.setenv("PLEXAPI_PLEXAPI_HTTP_CACHE", str(tmp_path / "http_cache"))
+    baseurl = "http://mocked-plex:32400"
+    requests_mock.get(f"{baseurl}/", text=SERVER_ROOT)
+    for token in ("admintoken", "usertoken"):
+        requests_mock.get(f"{baseurl}/library/sections", request_headers={"X-Plex-Token": token},
+                          text=f'<MediaContainer size="0" title1="{token}"/>')
+    admin = PlexServer(baseurl, token="admintoken")
+    user = PlexServer(baseurl, token="usertoken")
+    assert admin.query("/library/sections").get("title1") == "admintoken"
+    assert user.query("/library/sections").get("title1") == "usertoken"
+    # Repeated queries are still served from each token's own cache entry
+    calls = requests_mock.call_count
+    assert admin.query("/library/sections").get("title1") == "admintoken"
+    assert user.query("/library/sections").get("title1") == "usertoken"
+    assert requests_mock.call_count == calls
+
+
+def test_server_iterquery(mocked_plex, requests_mock):
+    url = mocked_plex.url("/iterquery")
+    requests_mock.get(url, text=(
+        '<MediaContainer size="3">'
+        '<Directory title="one"><Location path="/a"><Part id="1"/></Location></Directory>'
+        '<Video title="two"/>'
+        '<Directory title="three"/>'
+        '</MediaContainer>'
+    ))
+    elems = list(mocked_plex._iterquery("/iterquery"))
+    assert [elem.get("title") for elem in elems] == ["one", "two", "three"]
+    # Nested children stay attached to the yielded element
+    assert elems[0].find("Location/Part").get("id") == "1"
+    elems = list(mocked_plex._iterquery("/iterquery", tag="Directory"))
+    assert [elem.get("title") for elem in elems] == ["one", "three"]
+
+
+def test_server_iterquery_empty(mocked_plex, requests_mock):
+    requests_mock.get(mocked_plex.url("/iterquery"), text="")
+    assert list(mocked_plex._iterquery("/iterquery")) == []
+    requests_mock.get(mocked_plex.url("/iterquery"), text="this is not xml")
+    with pytest.raises(ElementTree.ParseError):
+        list(mocked_plex._iterquery("/iterquery"))
+
+
+def test_server_batch(mocked_plex, requests_mock):
+    requests_mock.get(mocked_plex.url("/clients"), text=SERVER_CLIENTS)
+    requests_mock.get(mocked_plex.url("/library"), text=SERVER_LIBRARY)
+    data = mocked_plex.batch(["/clients", "/library", "/clients"])
+    assert list(data) == ["/clients", "/library"]
+    assert len(data["/clients"].findall("Server")) == 3
+    assert data["/library"].get("identifier") == "com.plexapp.plugins.library"
+    paths = [request.path for request in requests_mock.request_history]
+    assert paths.count("/clients") == 1
+    assert paths.count("/library") == 1
+    assert mocked_plex.batch([]) == {}
+
+    requests_mock.get(mocked_plex.url("/missing"), status_code=404, text="Not Found")
+    with pytest.raises(NotFound):
+        mocked_plex.batch(["/clients", "/missing", "/library"])
+
+
 def test_server_Server_session(account):
     # Mock Session
     class MySession(Session):
@@ -226,6 +381,22 @@ def test_server_client_not_found(plex):
         plex.client("<This-client-should-not-be-found>")
 
 
+def test_server_client_mocked(mocked_plex, requests_mock):
+    requests_mock.get(mocked_plex.url("/clients"), text=SERVER_CLIENTS)
+    client = mocked_plex.client("living ROOM tv")
+    assert client.machineIdentifier == "client-1"
+    assert client.title == "Living Room TV"
+    # The unnamed client before it is skipped instead of raising AttributeError
+    with utils.patch.object(mocked_plex, "_myPlexClientPorts", return_value={"client-3": "32600"}):
+        client = mocked_plex.client("Kitchen Speaker")
+    assert client.machineIdentifier == "client-3"
+    assert client._baseurl == "http://192.168.1.23:32600"
+    with pytest.raises(NotFound):
+        mocked_plex.client("")
+    with pytest.raises(NotFound):
+        mocked_plex.client("<This-client-should-not-be-found>")
+
+
 def test_server_sessions(plex):
     assert len(plex.sessions()) >= 0
 
@@ -571,3 +742,121 @@ def test_server_agents(plex):
 def test_server_identity(plex):
     identity = plex.identity()
     assert identity.machineIdentifier == plex.machineIdentifier
+
+
+def _mock_async_client(monkeypatch, handler):
+    httpx = pytest.importorskip("httpx")
+    AsyncClient = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def _mock_async_session(monkeypatch, responses):
+    httpx = pytest.importorskip("httpx")
+    _mock_async_client(monkeypatch, lambda request: httpx.Response(200, text=responses[request.url.path]))
+
+
+def test_server_aquery(mocked_plex, monkeypatch):
+    _mock_async_session(monkeypatch, {"/statistics/resources": SERVER_RESOURCES})
+    data = asyncio.run(mocked_plex.aquery("/statistics/resources"))
+    assert data.tag == "MediaContainer"
+    assert len(data) == 3
+
+
+def test_server_aquery_not_found(mocked_plex, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    _mock_async_client(monkeypatch, lambda request: httpx.Response(404, text="Not Found"))
+    with pytest.raises(NotFound):
+        asyncio.run(mocked_plex.aquery("/asdf/1234/asdf"))
+
+
+def test_server_aquery_without_httpx(mocked_plex, monkeypatch):
+    monkeypatch.setattr("plexapi.server.httpx", None)
+    with pytest.raises(Unsupported):
+        asyncio.run(mocked_plex.aquery("/"))
+
+
+def test_server_aquery_event_loops():
+    pytest.importorskip("httpx")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = SERVER_ROOT.encode() if self.path == "/" else SERVER_RESOURCES.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        plex = PlexServer(f"http://127.0.0.1:{httpd.server_port}", token="faketoken")
+        # Each asyncio.run() has its own event loop, the keep-alive client must not be shared
+        assert len(asyncio.run(plex.aquery("/statistics/resources"))) == 3
+        assert len(asyncio.run(plex.aquery("/statistics/resources"))) == 3
+
+        async def queryAndClose():
+            try:
+                return await plex.aquery("/statistics/resources")
+            finally:
+                await plex.aclose()
+
+        assert len(asyncio.run(queryAndClose())) == 3
+        assert plex._asyncSession is None
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_server_async_client_without_h2(mocked_plex, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    AsyncClient = httpx.AsyncClient
+
+    def asyncClient(http2=False, **kwargs):
+        if http2:
+            raise ImportError("Using http2=True, but the 'h2' package is not installed.")
+        return AsyncClient(**kwargs)
+
+    async def createClient():
+        return mocked_plex._asyncClient()
+
+    monkeypatch.setattr(httpx, "AsyncClient", asyncClient)
+    assert isinstance(asyncio.run(createClient()), AsyncClient)
+
+
+def test_server_aclients(mocked_plex, monkeypatch):
+    _mock_async_session(monkeypatch, {"/clients": SERVER_CLIENTS})
+    threads = []
+
+    def clientPorts():
+        threads.append(threading.current_thread())
+        return {"client-3": "32600"}
+
+    with utils.patch.object(mocked_plex, "_myPlexClientPorts", side_effect=clientPorts):
+        clients = asyncio.run(mocked_plex.aclients())
+    assert [client.machineIdentifier for client in clients] == ["client-1", "client-2", "client-3"]
+    assert clients[2]._baseurl == "http://192.168.1.23:32600"
+    # The plex.tv port lookup must not block the event loop thread
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_server_asessions(mocked_plex, monkeypatch):
+    _mock_async_session(monkeypatch, {"/status/sessions": SERVER_SESSIONS})
+    sessions = asyncio.run(mocked_plex.asessions())
+    assert len(sessions) == 1
+    assert sessions[0].title == "Elephants Dream"
+    assert sessions[0].sessionKey == 5
+    assert sessions[0].player.title == "Living Room TV"
+
+
+def test_server_alibrary(mocked_plex, monkeypatch):
+    _mock_async_session(monkeypatch, {"/library": SERVER_LIBRARY})
+    library = asyncio.run(mocked_plex.alibrary())
+    assert library.identifier == "com.plexapp.plugins.library"
+    assert library.title1 == "Plex Library"